@@ -1,6 +1,178 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+from lxml import etree, html
 import json
+import os
+import re
+import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+# On-disk HTTP cache, kept next to this script rather than in the working directory
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scraper_cache')
+
+def create_session(cache=False):
+    """
+    Creates the HTTP session shared by the scrapers.
+
+    Reusing one session lets both scrapers share pooled connections instead of
+    opening a fresh TCP/TLS connection per request. Compressed transfer is
+    already requested by requests' default Accept-Encoding.
+
+    Args:
+        cache (bool): Whether to keep responses in an on-disk cache (revalidated
+              with ETag / Last-Modified) so re-running the script does not
+              re-download unchanged pages. Ignored if requests-cache is not installed.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    if cache and requests_cache is not None:
+        session = requests_cache.CachedSession(CACHE_PATH, expire_after=3600, cache_control=True)
+    else:
+        session = requests.Session()
+    session.headers.update({'User-Agent': 'PokeRole-data scraper (+https://github.com/antonydp/PokeRole-data)'})
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# The cached session is only created when running as a script, so importing
+# this module never touches the filesystem
+SESSION = create_session()
+
+# Everything from "Abilities:" onwards belongs to the next section of a badge's info
+_ABILITIES_RE = re.compile(r'Abilities:.*', re.S)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Bases for resolving the relative image URLs each site uses
+BASE_SEREBII = 'https://www.serebii.net/games/'
+BASE_FANDOM = 'https://pokemon.fandom.com/'
+
+# The ribbons page is one plain table, so it is read with precompiled XPath
+# queries on an lxml tree instead of going through BeautifulSoup
+_RIBBON_TABLE_XPATH = etree.XPath("//table[contains(concat(' ', normalize-space(@class), ' '), ' dextable ')]")
+# Rows are the table's own <tr>s (directly or through its sections), never those
+# of tables nested in a cell; the first one is the header row
+_RIBBON_ROWS_XPATH = etree.XPath("(./tr | ./thead/tr | ./tbody/tr | ./tfoot/tr)[position() > 1]")
+_CELLS_XPATH = etree.XPath("./td")  # Cells are always direct children of their row
+
+def _iter_rows(table):
+    """
+    Lazily yields a table's own rows, including those inside its thead/tbody/tfoot.
+
+    Rows of tables nested inside a cell are not included.
+
+    Args:
+        table (Tag): The table to iterate over.
+
+    Yields:
+        Tag: The table's <tr> elements, in document order.
+    """
+    for child in table.children:
+        if child.name == 'tr':
+            yield child
+        elif child.name in ('thead', 'tbody', 'tfoot'):
+            yield from (row for row in child.children if row.name == 'tr')
+
+def _iter_data_rows(table):
+    """
+    Lazily yields the rows of a table, skipping the header row.
+
+    Args:
+        table (Tag): The table to iterate over.
+
+    Returns:
+        generator: The table's <tr> elements after the first one.
+    """
+    rows = _iter_rows(table)
+    next(rows, None)  # Skip the header row
+    return rows
+
+def fetch_page(url):
+    """
+    Starts a streamed GET request for a page.
+
+    Args:
+        url (str): The URL of the page to fetch.
+
+    Returns:
+        requests.Response: The open response. Parse the body from its 'raw'
+              stream, then close it (e.g. with a 'with' block).
+    """
+    response = SESSION.get(url, timeout=30, stream=True)
+    try:
+        response.raise_for_status()  # Raise an exception for bad status codes
+    except requests.exceptions.HTTPError:
+        response.close()
+        raise
+    # Let the parser read the body straight from the socket rather than
+    # buffering it in response.content first; urllib3 undoes any gzip/deflate
+    response.raw.decode_content = True
+    return response
+
+def parse_pokemon_ribbons(page, encoding=None):
+    """
+    Parses Pokémon ribbon data (image URL, name, description) from a Serebii.net ribbons page.
+
+    Args:
+        page (file-like): The HTML of the ribbons page.
+        encoding (str, optional): The charset declared by the server, if any.
+
+    Yields:
+        dict: A ribbon with its 'name', 'image_url', and 'description'.
+    """
+    markup = page.read()
+    # lxml falls back to latin-1 when the page has no <meta charset>, so detect
+    # the encoding the same way BeautifulSoup does before handing it the bytes
+    dammit = UnicodeDammit(markup, known_definite_encodings=[encoding] if encoding else [], is_html=True)
+    tree = html.document_fromstring(markup, parser=html.HTMLParser(encoding=dammit.original_encoding))
+
+    # Find the main table containing ribbon information
+    ribbon_tables = _RIBBON_TABLE_XPATH(tree)
+
+    if not ribbon_tables:
+        print("Error: Could not find the ribbon table.")
+        return
+
+    # Iterate through each row in the table (skipping the header row)
+    for row in _RIBBON_ROWS_XPATH(ribbon_tables[0]):
+        columns = _CELLS_XPATH(row)
+        if len(columns) >= 3:  # Ensure there are enough columns for image, name, and description
+            image_column = columns[0]
+            name_column = columns[1]
+            description_column = columns[2]
+
+            # Extract image URL
+            img_tag = image_column.find('.//img')
+            image_url = img_tag.get('src') if img_tag is not None else None
+            # Serebii uses relative URLs, so we need to make them absolute
+            if image_url:
+                image_url = urljoin(BASE_SEREBII, image_url)
+
+            # Extract name
+            name = ''.join(text.strip() for text in name_column.itertext())
+
+            # Extract description
+            description = ' '.join(filter(None, (text.strip() for text in description_column.itertext())))
+
+            yield {
+                'name': name,
+                'image_url': image_url,
+                'description': description
+            }
 
 def scrape_pokemon_ribbons(url):
     """
@@ -16,55 +188,124 @@ def scrape_pokemon_ribbons(url):
     """
     ribbons_data = []
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        soup = BeautifulSoup(response.content, 'html.parser')
+        with fetch_page(url) as response:
+            # Only trust response.encoding when the server sent a charset; otherwise
+            # requests assumes ISO-8859-1 for any text/* response
+            declared = 'charset' in response.headers.get('Content-Type', '').lower()
+            # Collect row by row so ribbons parsed before an error are still returned
+            for ribbon in parse_pokemon_ribbons(response.raw, response.encoding if declared else None):
+                ribbons_data.append(ribbon)
+    except requests.exceptions.RequestException as e:
+        print(f"Error making request to {url}: {e}")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
 
-        # Find the main table containing ribbon information
-        ribbon_table = soup.find('table', class_='dextable')
+    return ribbons_data
 
-        if not ribbon_table:
-            print("Error: Could not find the ribbon table.")
-            return []
+def parse_gym_badges(page):
+    """
+    Parses Pokémon Gym Badge data (name, image URL, full description) from a Fandom Wiki page.
 
-        # Iterate through each row in the table (skipping the header row)
-        rows = ribbon_table.find_all('tr')[1:]  # Skip the header row
+    Args:
+        page (file-like): The HTML of the Pokémon Fandom Wiki Gym Badges page.
+
+    Yields:
+        dict: A Gym Badge with its 'name', 'image_url', and a more complete 'description'.
+    """
+    # Only the article body is needed, so skip the wiki's navigation, sidebars and
+    # footer. The body is kept whole (rather than straining down to headings and
+    # tables) so the sibling walks below still see the page's real structure.
+    strainer = SoupStrainer('div', class_='mw-parser-output')
+    soup = BeautifulSoup(page, 'lxml', parse_only=strainer)
+
+    # Find all prettytable elements, which contain the badge information
+    # Exclude the "Anime exclusive" tables for now, as their structure might differ slightly
+    content_tables = soup.find_all('table', class_='prettytable')
+
+    # Filter out the "Anime exclusive" section for structured data
+    # We'll stop processing tables once we hit the "Anime exclusive" heading
+    anime_exclusive_heading = soup.find('h2', id='Anime_exclusive')
+
+    relevant_tables = []
+    if anime_exclusive_heading:
+        # Get all elements between the first league heading and the anime exclusive heading
+        start_element = soup.find('h2', id='Indigo_League')
+        if start_element:
+            # A single pass over the following siblings; tables under h3
+            # subsections (e.g., Unova) are siblings too, so no nested walk is needed
+            for element in start_element.next_siblings:
+                if element is anime_exclusive_heading:
+                    break
+                if getattr(element, 'name', None) == 'table' and 'prettytable' in (element.get('class') or []):
+                    relevant_tables.append(element)
+    else:
+        relevant_tables = content_tables # If no anime exclusive, take all
+
+    # The Paldea League description is shared by all of its badges, so look it up once
+    paldea_heading = soup.find('h2', id='Paldea_League')
+    paldea_desc_p = paldea_heading.find_next_sibling('p') if paldea_heading else None
+    paldea_description = paldea_desc_p.get_text(strip=True) if paldea_desc_p else None
 
-        for row in rows:
-            columns = row.find_all('td')
-            if len(columns) >= 3:  # Ensure there are enough columns for image, name, and description
+    for table in relevant_tables:
+        # Iterate through each row in the table (skipping the header row)
+        for row in _iter_data_rows(table):
+            columns = row.find_all('td', recursive=False)  # Don't descend into nested tables
+            if len(columns) >= 2: # Ensure there are enough columns for image and info
                 image_column = columns[0]
-                name_column = columns[1]
-                description_column = columns[2]
+                info_column = columns[1] # This column contains both name and description
 
                 # Extract image URL
-                img_tag = image_column.find('img')
-                if img_tag and 'src' in img_tag.attrs:
-                    image_url = img_tag['src']
-                    # Serebii uses relative URLs, so we need to make them absolute
-                    if not image_url.startswith('http'):
-                        image_url = "https://www.serebii.net/games/" + image_url
-                else:
-                    image_url = None
+                img_tag = image_column.find('img', class_='mw-file-element')
+                # Lazy-loaded images keep the real URL in data-src
+                image_url = (img_tag.get('data-src') or img_tag.get('src')) if img_tag is not None else None
 
-                # Extract name
-                name = name_column.get_text(strip=True)
+                # Make sure image_url is absolute
+                if image_url:
+                    image_url = urljoin(BASE_FANDOM, image_url)
 
-                # Extract description
-                description = description_column.get_text(separator=' ', strip=True)
-
-                ribbons_data.append({
-                    'name': name,
+                # Extract name
+                badge_name = ""
+                name_tag = info_column.find('b')
+                if name_tag:
+                    badge_name = name_tag.get_text(strip=True).replace('The ', '')
+                else:
+                    # Fallback if <b> not found, try to extract from the first <span> with an ID
+                    span_with_id = info_column.find('span', id=True)
+                    if span_with_id:
+                        badge_name = span_with_id.get_text(strip=True).replace('The ', '')
+                    else:
+                        badge_name = "Unnamed Badge" # Default if no clear name found
+
+                # Extract the full text of the info_column
+                full_info_text = ' '.join(info_column.stripped_strings)
+
+                # Now, try to isolate the description by removing the badge name and any leading "The "
+                # We also need to be careful with "Abilities:" as it marks the next section
+                description = full_info_text
+
+                # Remove the "The [Badge Name]" prefix
+                if badge_name and full_info_text.startswith(f"The {badge_name}"):
+                    description = full_info_text[len(f"The {badge_name}"):]
+                elif badge_name: # Handle cases where "The " might not be there but name is
+                     description = full_info_text.replace(badge_name, "", 1)
+
+                # Take everything up to "Abilities:" and collapse extra spaces
+                description = _ABILITIES_RE.sub('', description, count=1)
+                description = _WHITESPACE_RE.sub(' ', description).strip()
+
+                # For Paldea League, the description is simpler and should be taken as is
+                if badge_name == "Unnamed Badge": # This might need a better identifier for Paldea
+                     # Use the Paldea description found before the loop
+                     if paldea_description:
+                         description = paldea_description
+                     else:
+                         description = full_info_text # Fallback
+
+                yield {
+                    'name': badge_name,
                     'image_url': image_url,
                     'description': description
-                })
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error making request to {url}: {e}")
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-
-    return ribbons_data
+                }
 
 def scrape_gym_badges(url):
     """
@@ -80,117 +321,10 @@ def scrape_gym_badges(url):
     """
     badges_data = []
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Find all prettytable elements, which contain the badge information
-        # Exclude the "Anime exclusive" tables for now, as their structure might differ slightly
-        content_tables = soup.find_all('table', class_='prettytable')
-
-        # Filter out the "Anime exclusive" section for structured data
-        # We'll stop processing tables once we hit the "Anime exclusive" heading
-        anime_exclusive_heading = soup.find('h2', id='Anime_exclusive')
-
-        relevant_tables = []
-        if anime_exclusive_heading:
-            # Get all elements between the first league heading and the anime exclusive heading
-            start_element = soup.find('h2', id='Indigo_League')
-            if start_element:
-                current_element = start_element
-                while current_element and current_element != anime_exclusive_heading:
-                    if current_element.name == 'table':
-                        relevant_tables.append(current_element)
-                    current_element = current_element.find_next_sibling()
-                    # Also check for h3 as tables can be under h3 as well (e.g., Unova)
-                    if current_element and current_element.name == 'h3':
-                        temp_element = current_element.find_next_sibling()
-                        while temp_element and temp_element.name != 'h2' and temp_element.name != 'h3':
-                            if temp_element.name == 'table':
-                                relevant_tables.append(temp_element)
-                            temp_element = temp_element.find_next_sibling()
-                        current_element = temp_element # Move to the next h2 or h3
-        else:
-            relevant_tables = content_tables # If no anime exclusive, take all
-
-        for table in relevant_tables:
-            # Iterate through each row in the table (skipping the header row)
-            rows = table.find_all('tr')
-            if len(rows) > 1: # Ensure there's at least one data row after the header
-                for row in rows[1:]: # Skip the first row (header)
-                    columns = row.find_all('td')
-                    if len(columns) >= 2: # Ensure there are enough columns for image and info
-                        image_column = columns[0]
-                        info_column = columns[1] # This column contains both name and description
-
-                        # Extract image URL
-                        img_tag = image_column.find('img', class_='mw-file-element')
-                        if img_tag and 'data-src' in img_tag.attrs:
-                            image_url = img_tag['data-src']
-                        elif img_tag and 'src' in img_tag.attrs:
-                            image_url = img_tag['src']
-                        else:
-                            image_url = None
-
-                        # Make sure image_url is absolute
-                        if image_url and not image_url.startswith('http'):
-                            image_url = "https://pokemon.fandom.com" + image_url
-
-                        # Extract name
-                        badge_name = ""
-                        name_tag = info_column.find('b')
-                        if name_tag:
-                            badge_name = name_tag.get_text(strip=True).replace('The ', '')
-                        else:
-                            # Fallback if <b> not found, try to extract from the first <span> with an ID
-                            span_with_id = info_column.find('span', id=True)
-                            if span_with_id:
-                                badge_name = span_with_id.get_text(strip=True).replace('The ', '')
-                            else:
-                                badge_name = "Unnamed Badge" # Default if no clear name found
-
-                        # Extract the full text of the info_column
-                        full_info_text = info_column.get_text(separator=' ', strip=True)
-
-                        # Now, try to isolate the description by removing the badge name and any leading "The "
-                        # We also need to be careful with "Abilities:" as it marks the next section
-                        description = full_info_text
-
-                        # Remove the "The [Badge Name]" prefix
-                        if badge_name and full_info_text.startswith(f"The {badge_name}"):
-                            description = full_info_text.replace(f"The {badge_name}", "", 1).strip()
-                        elif badge_name: # Handle cases where "The " might not be there but name is
-                             description = full_info_text.replace(badge_name, "", 1).strip()
-
-                        # Remove the "is given out at..." part from the beginning of the description.
-                        # This pattern seems to consistently precede the core info you want.
-                        # Then take everything up to "Abilities:"
-                        if description.startswith("is given out at"):
-                            # Split by "Abilities:" and take the first part
-                            parts = description.split("Abilities:", 1)
-                            description = parts[0].strip()
-                        elif "Abilities:" in description:
-                             # If "is given out at" is not there, but "Abilities" is, still trim after it.
-                             parts = description.split("Abilities:", 1)
-                             description = parts[0].strip()
-
-                        # Final cleanup: remove extra spaces
-                        description = ' '.join(description.split())
-
-                        # For Paldea League, the description is simpler and should be taken as is
-                        if badge_name == "Unnamed Badge": # This might need a better identifier for Paldea
-                             # Re-evaluate the description for Paldea specifically
-                             paldea_desc_p = soup.find('h2', id='Paldea_League').find_next_sibling('p')
-                             if paldea_desc_p:
-                                 description = paldea_desc_p.get_text(strip=True)
-                             else:
-                                 description = full_info_text # Fallback
-
-                        badges_data.append({
-                            'name': badge_name,
-                            'image_url': image_url,
-                            'description': description
-                        })
+        with fetch_page(url) as response:
+            # Collect row by row so badges parsed before an error are still returned
+            for badge in parse_gym_badges(response.raw):
+                badges_data.append(badge)
     except requests.exceptions.RequestException as e:
         print(f"Error making request to {url}: {e}")
     except Exception as e:
@@ -198,32 +332,59 @@ def scrape_gym_badges(url):
 
     return badges_data
 
+def scrape_all(gym_badges_url, ribbons_page_url):
+    """
+    Scrapes the gym badges and ribbons pages concurrently.
+
+    Each page is fetched and then parsed in its own worker thread, so the two
+    pages are handled side by side; a page's parse still waits for its own
+    download to finish.
+
+    Args:
+        gym_badges_url (str): The URL of the Pokémon Fandom Wiki Gym Badges page.
+        ribbons_page_url (str): The URL of the Serebii.net ribbons page.
+
+    Returns:
+        tuple: The scraped gym badges and ribbons, in that order.
+    """
+    # One worker per page
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        badges_future = executor.submit(scrape_gym_badges, gym_badges_url)
+        ribbons_future = executor.submit(scrape_pokemon_ribbons, ribbons_page_url)
+        return badges_future.result(), ribbons_future.result()
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape Pokémon gym badges and ribbons into JSON files.")
+    parser.add_argument('--verbose', action='store_true', help="also print the scraped JSON to stdout")
+    args = parser.parse_args()
+
+    SESSION = create_session(cache=True)
+
     gym_badges_url = "https://pokemon.fandom.com/wiki/List_of_Gym_Badges"
-    all_gym_badges = scrape_gym_badges(gym_badges_url)
+    ribbons_page_url = "https://www.serebii.net/games/ribbons.shtml"
+    all_gym_badges, all_ribbons = scrape_all(gym_badges_url, ribbons_page_url)
 
     if all_gym_badges:
-        json_output = json.dumps(all_gym_badges, indent=4, ensure_ascii=False) # ensure_ascii=False for proper display of non-ASCII characters
-        print(json_output)
+        if args.verbose:
+            json.dump(all_gym_badges, sys.stdout, indent=4, ensure_ascii=False)
+            print()
 
+        # Stream the JSON straight to the file instead of building the whole string first
         with open("pokemon_gym_badges.json", "w", encoding='utf-8') as f:
-            f.write(json_output)
-        print("\nGym badge data saved to pokemon_gym_badges.json")
+            json.dump(all_gym_badges, f, indent=4, ensure_ascii=False) # ensure_ascii=False for proper display of non-ASCII characters
+        print("Gym badge data saved to pokemon_gym_badges.json")
     else:
         print("No gym badge data was scraped.")
-        
-        
-    ribbons_page_url = "https://www.serebii.net/games/ribbons.shtml"
-    all_ribbons = scrape_pokemon_ribbons(ribbons_page_url)
 
     if all_ribbons:
-        # Convert the list of dictionaries to a JSON object
-        json_output = json.dumps(all_ribbons, indent=4)
-        print(json_output)
+        if args.verbose:
+            json.dump(all_ribbons, sys.stdout, indent=4)
+            print()
 
-        # Optionally, save to a file
         with open("pokemon_ribbons.json", "w") as f:
-            f.write(json_output)
-        print("\nRibbon data saved to pokemon_ribbons.json")
+            json.dump(all_ribbons, f, indent=4)
+        print("Ribbon data saved to pokemon_ribbons.json")
     else:
-        print("No ribbon data was scraped.")
\ No newline at end of file
+        print("No ribbon data was scraped.")
+
+    SESSION.close()